@@ -1,16 +1,31 @@
 from __future__ import annotations
 
+import errno
 import hashlib
 import json
+import os
+import shutil
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
+
+try:  # optional fast path: `pip install sleepy_factory[fast]`
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 ARTIFACTS_ROOT = REPO_ROOT / "artifacts"
 
 JOB_SPEC_FILENAME = "job_spec.json"
 MANIFEST_FILENAME = "manifest.json"
+# Append-only record log used while manifest writes are deferred (see manifest_batch).
+MANIFEST_LOG_FILENAME = "manifest.jsonl"
+
+_WRITE_CHUNK = 1 << 20
 
 
 @dataclass(frozen=True)
@@ -23,82 +38,389 @@ class ArtifactRecord:
     created_at: str  # keep for now; callers may choose deterministic values
 
 
-def job_dir(job_id: str) -> Path:
-    p = ARTIFACTS_ROOT / str(job_id)
-    p.mkdir(parents=True, exist_ok=True)
-    return p
+@dataclass
+class _CachedManifest:
+    manifest: dict[str, Any]
+    index: dict[str, int]  # relpath -> position in manifest["artifacts"]; never persisted
+    disk_state: tuple[int | None, int | None]  # see _disk_state(); what this entry matches
+    dirty: bool = False
 
 
-def stage_dir(job_id: str, stage: str) -> Path:
-    p = job_dir(job_id) / stage if stage else job_dir(job_id)
+# Manifests are cached per manifest path (not per job_id) so that pointing ARTIFACTS_ROOT
+# somewhere else (tests do this) can never serve a stale entry.
+# Entries are dropped once flushed at the end of a batch; the bound covers everything else.
+_MANIFEST_CACHE: dict[Path, _CachedManifest] = {}
+_MANIFEST_CACHE_MAX = 1024
+_MANIFEST_LOCK = threading.Lock()
+
+# Directories already mkdir'ed by this process; skips the syscall on every artifact write.
+_DIRS_CREATED: set[Path] = set()
+_DIRS_CREATED_MAX = 4096
+_DIRS_LOCK = threading.Lock()
+
+# Per-thread nesting depth of manifest_batch() per job_id.
+_BATCH_STATE = threading.local()
+
+
+def _dumps(obj: Any, indent: bool = True) -> bytes:
+    """Serialize to UTF-8 JSON (orjson when installed, stdlib otherwise)."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    # Parse straight from bytes; no intermediate str decode.
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _ensure_dir(p: Path) -> Path:
+    # Absolute paths include ARTIFACTS_ROOT, so re-pointing it (tests do) gets fresh dirs.
+    if p in _DIRS_CREATED:
+        return p
     p.mkdir(parents=True, exist_ok=True)
+    with _DIRS_LOCK:
+        if len(_DIRS_CREATED) >= _DIRS_CREATED_MAX:
+            # Long-running workers see an unbounded stream of jobs; just start over.
+            _DIRS_CREATED.clear()
+        _DIRS_CREATED.add(p)
     return p
 
 
-def _sha256(data: bytes) -> str:
-    return hashlib.sha256(data).hexdigest()
+def _recreate_dir(p: Path) -> None:
+    # The cache only says this process created `p` once; clean-artifacts (or anything else)
+    # may have removed it since. Forget it and mkdir again.
+    with _DIRS_LOCK:
+        _DIRS_CREATED.discard(p)
+    _ensure_dir(p)
+
+
+def _open_for_write(p: Path, mode: str = "wb") -> BinaryIO:
+    """Open `p` for writing, recreating its directory (once) if it has disappeared."""
+    try:
+        return p.open(mode)
+    except FileNotFoundError:
+        _recreate_dir(p.parent)
+        return p.open(mode)
+
+
+def _move_into(src: Path, p: Path) -> None:
+    """os.replace(src, p), recreating p's directory (once) if it has disappeared."""
+    try:
+        os.replace(src, p)
+    except FileNotFoundError:
+        _recreate_dir(p.parent)
+        os.replace(src, p)
+
+
+def job_dir(job_id: str) -> Path:
+    return _ensure_dir(ARTIFACTS_ROOT / str(job_id))
+
+
+def stage_dir(job_id: str, stage: str) -> Path:
+    return _ensure_dir(ARTIFACTS_ROOT / str(job_id) / stage) if stage else job_dir(job_id)
+
+
+def _atomic_write(p: Path, data: bytes) -> None:
+    # Write next to the target and rename over it: readers (other workers, show-job) never
+    # see a half-written file, and a crash leaves the previous version intact.
+    tmp = p.with_name(f".{p.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with _open_for_write(tmp) as f:
+            f.write(data)
+        os.replace(tmp, p)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _atomic_write_hashed(p: Path, data: bytes) -> str:
+    """Like _atomic_write, but hash each chunk right after writing it; returns the sha256."""
+    h = hashlib.sha256()
+    view = memoryview(data)
+    tmp = p.with_name(f".{p.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with _open_for_write(tmp) as f:
+            # Chunks are hashed while still in CPU cache instead of in a second full pass.
+            for start in range(0, len(view), _WRITE_CHUNK):
+                chunk = view[start : start + _WRITE_CHUNK]
+                f.write(chunk)
+                h.update(chunk)
+        os.replace(tmp, p)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return h.hexdigest()
+
+
+def _sha256_file(p: Path) -> tuple[str, int]:
+    """Return (sha256 hexdigest, size) of a file from a single open + streaming read."""
+    # file_digest feeds hashlib's C loop straight from the fd (GIL released), so the
+    # file is never held in memory as a whole.
+    with p.open("rb") as f:
+        digest = hashlib.file_digest(f, "sha256").hexdigest()
+        return digest, os.fstat(f.fileno()).st_size
 
 
 def _manifest_path(job_id: str) -> Path:
     return job_dir(job_id) / MANIFEST_FILENAME
 
 
-def load_manifest(job_id: str) -> dict[str, Any]:
+def _manifest_log_path(job_id: str) -> Path:
+    return job_dir(job_id) / MANIFEST_LOG_FILENAME
+
+
+def _disk_state(job_id: str) -> tuple[int | None, int | None]:
+    """(manifest.json mtime_ns, manifest.jsonl size); None for a missing file."""
+    states: list[int | None] = []
+    for p, attr in (
+        (_manifest_path(job_id), "st_mtime_ns"),
+        (_manifest_log_path(job_id), "st_size"),
+    ):
+        try:
+            states.append(getattr(p.stat(), attr))
+        except FileNotFoundError:
+            states.append(None)
+    return states[0], states[1]
+
+
+def _read_manifest_log(job_id: str) -> list[dict[str, Any]]:
+    try:
+        data = _manifest_log_path(job_id).read_bytes()
+    except FileNotFoundError:
+        return []
+
+    records = []
+    for line in data.splitlines():
+        try:
+            records.append(_loads(line))
+        except ValueError:
+            # A torn trailing line from a crash mid-append; everything before it is intact.
+            continue
+    return records
+
+
+def _relpath_index(manifest: dict[str, Any]) -> dict[str, int]:
+    return {a.get("relpath"): i for i, a in enumerate(manifest.get("artifacts", []))}
+
+
+def _apply_record(entry: _CachedManifest, rec_dict: dict[str, Any]) -> None:
+    artifacts: list[dict[str, Any]] = entry.manifest["artifacts"]
+    relpath = rec_dict["relpath"]
+
+    i = entry.index.get(relpath)
+    if i is None:
+        entry.index[relpath] = len(artifacts)
+        artifacts.append(rec_dict)
+    else:
+        artifacts[i] = rec_dict
+    entry.dirty = True
+
+
+def _cached_manifest(job_id: str) -> _CachedManifest:
+    """
+    Return the cache entry for a job, (re)loading it when the files on disk changed.
+    Records left in manifest.jsonl (a batch that never flushed) are folded in.
+    Caller must hold _MANIFEST_LOCK.
+    """
     p = _manifest_path(job_id)
-    if not p.exists():
+    entry = _MANIFEST_CACHE.get(p)
+    if entry is not None and entry.dirty:
+        # Unflushed local changes win over whatever is on disk.
+        return entry
+
+    disk_state = _disk_state(job_id)
+    if entry is not None and entry.disk_state == disk_state:
+        return entry
+
+    if disk_state[0] is None:
         # Deterministic baseline manifest; timestamps belong in the job spec or per-artifact records.
-        return {"job_id": str(job_id), "artifacts": []}
-    return json.loads(p.read_text(encoding="utf-8"))
+        manifest: dict[str, Any] = {"job_id": str(job_id), "artifacts": []}
+    else:
+        manifest = _loads(p.read_bytes())
+        manifest["artifacts"] = list(manifest.get("artifacts", []))
+
+    entry = _CachedManifest(
+        manifest=manifest, index=_relpath_index(manifest), disk_state=disk_state
+    )
+    for rec_dict in _read_manifest_log(job_id):
+        _apply_record(entry, rec_dict)
+
+    _cache_put(p, entry)
+    return entry
+
+
+def _cache_put(p: Path, entry: _CachedManifest) -> None:
+    """Store a cache entry, dropping clean entries first if full. Caller holds the lock."""
+    if p not in _MANIFEST_CACHE and len(_MANIFEST_CACHE) >= _MANIFEST_CACHE_MAX:
+        # Clean entries just mirror the files on disk; dirty ones hold unflushed records.
+        for key in [k for k, e in _MANIFEST_CACHE.items() if not e.dirty]:
+            del _MANIFEST_CACHE[key]
+    _MANIFEST_CACHE[p] = entry
+
+
+def load_manifest(job_id: str) -> dict[str, Any]:
+    with _MANIFEST_LOCK:
+        manifest = _cached_manifest(job_id).manifest
+        # Hand out a copy so callers can't mutate the cache behind our back. Records are
+        # flat dicts of str/int, so copying each one makes the copy a deep one.
+        return {**manifest, "artifacts": [dict(a) for a in manifest["artifacts"]]}
+
+
+def _write_manifest_file(job_id: str, manifest: dict[str, Any]) -> tuple[int | None, int | None]:
+    _atomic_write(_manifest_path(job_id), _dumps(manifest))
+    # manifest.json now holds everything the log did; replaying it again would be a no-op.
+    _manifest_log_path(job_id).unlink(missing_ok=True)
+    return _disk_state(job_id)
 
 
 def write_manifest(job_id: str, manifest: dict[str, Any]) -> None:
-    job_dir(job_id).mkdir(parents=True, exist_ok=True)
-    _manifest_path(job_id).write_text(
-        json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8"
-    )
+    manifest = {**manifest, "artifacts": list(manifest.get("artifacts", []))}
+    with _MANIFEST_LOCK:
+        disk_state = _write_manifest_file(job_id, manifest)
+        _cache_put(
+            _manifest_path(job_id),
+            _CachedManifest(
+                manifest=manifest, index=_relpath_index(manifest), disk_state=disk_state
+            ),
+        )
+
+
+def _flush_locked(job_id: str) -> _CachedManifest:
+    entry = _cached_manifest(job_id)
+    if entry.dirty:
+        entry.disk_state = _write_manifest_file(job_id, entry.manifest)
+        entry.dirty = False
+    return entry
+
+
+def flush_manifest(job_id: str) -> None:
+    """Write manifest.json if there are pending changes (no-op otherwise)."""
+    with _MANIFEST_LOCK:
+        _flush_locked(job_id)
+
+
+def _flush_and_evict(job_id: str) -> None:
+    # After a flush the entry only mirrors disk; a worker rarely touches the job again, so
+    # don't keep it for the life of the process.
+    with _MANIFEST_LOCK:
+        _flush_locked(job_id)
+        _MANIFEST_CACHE.pop(_manifest_path(job_id), None)
+
+
+def reset_caches() -> None:
+    """Forget cached manifests and created dirs (call after deleting artifacts on disk)."""
+    with _MANIFEST_LOCK:
+        _MANIFEST_CACHE.clear()
+    with _DIRS_LOCK:
+        _DIRS_CREATED.clear()
+
+
+def _batch_depths() -> dict[str, int]:
+    depths = getattr(_BATCH_STATE, "depths", None)
+    if depths is None:
+        depths = _BATCH_STATE.depths = {}
+    return depths
+
+
+@contextmanager
+def manifest_batch(job_id: str) -> Iterator[None]:
+    """
+    Defer manifest writes for `job_id` on this thread until the block exits.
+
+    Every append inside the block only updates the in-memory manifest; a single
+    write happens on exit (also when the block raises, so files already on disk
+    stay recorded). Batches nest; only the outermost one writes.
+    """
+    job_id = str(job_id)
+    depths = _batch_depths()
+    depths[job_id] = depths.get(job_id, 0) + 1
+    try:
+        yield
+    finally:
+        depths[job_id] -= 1
+        if not depths[job_id]:
+            del depths[job_id]
+            _flush_and_evict(job_id)
 
 
 def append_manifest(job_id: str, record: ArtifactRecord) -> None:
     """
     Keep the manifest stable by de-duping on relpath.
     If a stage is re-run, the newest record replaces the older record for that file.
-    """
-    manifest = load_manifest(job_id)
-    artifacts: list[dict[str, Any]] = list(manifest.get("artifacts", []))
 
+    The manifest is kept in memory between calls, so each append is an O(1) update of the
+    cached copy followed by a single write; nothing is re-read or re-scanned. Inside
+    manifest_batch() the manifest.json rewrite is deferred to the end of the batch and the
+    record is appended to manifest.jsonl instead, so a crash mid-batch loses nothing.
+    """
     rec_dict = asdict(record)
-    relpath = rec_dict["relpath"]
-
-    replaced = False
-    for i, existing in enumerate(artifacts):
-        if existing.get("relpath") == relpath:
-            artifacts[i] = rec_dict
-            replaced = True
-            break
+    deferred = str(job_id) in _batch_depths()
 
-    if not replaced:
-        artifacts.append(rec_dict)
+    with _MANIFEST_LOCK:
+        entry = _cached_manifest(job_id)
+        _apply_record(entry, rec_dict)
+        if deferred:
+            with _open_for_write(_manifest_log_path(job_id), "ab") as f:
+                f.write(_dumps(rec_dict, indent=False) + b"\n")
 
-    manifest["artifacts"] = artifacts
-    write_manifest(job_id, manifest)
+    if not deferred:
+        flush_manifest(job_id)
 
 
-def write_bytes(job_id: str, stage: str, filename: str, data: bytes, kind: str) -> Path:
-    out_dir = stage_dir(job_id, stage)
-    p = out_dir / filename
-    p.write_bytes(data)
-
+def _record_artifact(job_id: str, stage: str, p: Path, nbytes: int, sha256: str, kind: str) -> None:
     rec = ArtifactRecord(
         stage=stage,
         kind=kind,
         relpath=p.relative_to(job_dir(job_id)).as_posix(),
-        bytes=len(data),
-        sha256=_sha256(data),
+        bytes=nbytes,
+        sha256=sha256,
         # Caller controls determinism here; if you want fully deterministic artifacts,
         # have the caller pass a deterministic created_at in the *content* rather than the manifest.
         created_at="",
     )
     append_manifest(job_id, rec)
+
+
+def write_bytes(job_id: str, stage: str, filename: str, data: bytes, kind: str) -> Path:
+    p = stage_dir(job_id, stage) / filename
+    sha256 = _atomic_write_hashed(p, data)
+
+    _record_artifact(job_id, stage, p, len(data), sha256, kind)
+    return p
+
+
+def write_path(job_id: str, stage: str, filename: str, src_path: Path, kind: str) -> Path:
+    """
+    Move an already-written file into the stage dir and record it.
+
+    Unlike write_bytes, the content never passes through Python memory: the file is
+    renamed into place and hashed in a single streaming read. Keep `src_path` on the
+    same filesystem (ideally inside stage_dir) so the move is a cheap rename; across
+    filesystems it falls back to an in-kernel copy (copy_file_range/sendfile).
+    """
+    p = stage_dir(job_id, stage) / filename
+    try:
+        _move_into(src_path, p)
+    except OSError as exc:
+        if exc.errno != errno.EXDEV:
+            raise
+        tmp = p.with_name(f".{p.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            shutil.copyfile(src_path, tmp)
+            os.replace(tmp, p)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        Path(src_path).unlink()
+
+    sha256, nbytes = _sha256_file(p)
+    _record_artifact(job_id, stage, p, nbytes, sha256, kind)
     return p
 
 
@@ -107,8 +429,7 @@ def write_text(job_id: str, stage: str, filename: str, text: str, kind: str) ->
 
 
 def write_json(job_id: str, stage: str, filename: str, obj: Any, kind: str) -> Path:
-    text = json.dumps(obj, indent=2, ensure_ascii=False)
-    return write_text(job_id, stage, filename, text, kind=kind)
+    return write_bytes(job_id, stage, filename, _dumps(obj), kind=kind)
 
 
 def write_job_spec(job_id: str, spec: Any) -> Path:
@@ -116,7 +437,8 @@ def write_job_spec(job_id: str, spec: Any) -> Path:
 
 
 def load_job_spec(job_id: str) -> dict[str, Any] | None:
-    p = job_dir(job_id) / JOB_SPEC_FILENAME
-    if not p.exists():
+    try:
+        data = (job_dir(job_id) / JOB_SPEC_FILENAME).read_bytes()
+    except FileNotFoundError:
         return None
-    return json.loads(p.read_text(encoding="utf-8"))
+    return _loads(data)
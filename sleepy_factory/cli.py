@@ -1,52 +1,188 @@
 from __future__ import annotations
 
-import io
+import functools
+import logging
 import os
 import shutil
+import signal
 import socket
 import struct
 import subprocess
 import tempfile
 import threading
+import time
 import uuid
-import wave
 from collections import defaultdict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any, Final
+from string import Template
+from typing import Any, Final, NamedTuple
 
 from rich import print
-from sqlalchemy import and_, or_, select
-from sqlalchemy.orm import Session
+from rich.logging import RichHandler
+from sqlalchemy import (
+    Integer,
+    Row,
+    Update,
+    and_,
+    bindparam,
+    case,
+    func,
+    insert,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import InstrumentedAttribute, Session
 
 from sleepy_factory.artifacts import (
     ARTIFACTS_ROOT,
     job_dir,
     load_job_spec,
     load_manifest,
+    manifest_batch,
+    reset_caches,
+    stage_dir,
     write_bytes,
     write_job_spec,
     write_json,
+    write_path,
     write_text,
 )
-from sleepy_factory.db.models import Job, StageStatus
-from sleepy_factory.db.session import SessionLocal
+from sleepy_factory.config import settings
+from sleepy_factory.db.models import STAGES, Job, StageStatus
+from sleepy_factory.db.notify import (
+    ORCHESTRATOR,
+    Listener,
+    notify,
+    notify_columns,
+    notify_columns_when,
+)
+from sleepy_factory.db.session import LeaseSessionLocal, SessionLocal
 
-STAGES: Final[list[str]] = ["script", "audio", "visuals", "render"]
+log = logging.getLogger(__name__)
 
 # Keep placeholder outputs small even if the spec requests long durations.
 MAX_PLACEHOLDER_AUDIO_SECONDS: Final[int] = 5
 MAX_PLACEHOLDER_RENDER_SECONDS: Final[int] = 6
 
+# libx264 sizes its own thread pool to the machine; -threads is only passed when
+# SF_FFMPEG_THREADS is set, e.g. to leave room for other workers on the host. Concurrency is
+# bounded by the render claim batch: a render worker encodes one job at a time.
+FFMPEG_THREADS: Final[int | None] = settings.ffmpeg_threads
+_FFMPEG_STDERR_TAIL_BYTES: Final[int] = 64 * 1024
+
+# Upper bound on how long the orchestrator trusts "no notifications" to mean "no work".
+ORCHESTRATOR_RESYNC_SECONDS: Final[float] = 30.0
+# Cap for an idle worker's fallback poll while its LISTEN connection is up.
+IDLE_POLL_MAX_SECONDS: Final[float] = 10.0
+
+# Jobs claimed per poll. Cheap stages amortize the claim round-trip over a batch; render
+# holds one lease at a time since a single encode can take a while.
+CLAIM_BATCH: Final[dict[str, int]] = {"script": 8, "audio": 8, "visuals": 8, "render": 1}
+
+_AUDIO_SAMPLE_RATE: Final[int] = 48_000
+_AUDIO_CHANNELS: Final[int] = 2
+_AUDIO_SAMPWIDTH: Final[int] = 2  # 16-bit PCM
+
+# Stages whose work `sf dev` hands to a process pool instead of running on the worker thread.
+PROCESS_POOL_STAGES: Final[frozenset[str]] = frozenset({"audio", "render"})
+
+_SCRIPT_MD_TMPL: Final[Template] = Template(
+    """\
+# Video Script: $topic
+
+## Metadata
+- Format: $video_format
+- Target length: $length_seconds seconds
+- Voice: $voice
+- Spec created_at: $created_at
+
+## Hook
+Today we're talking about: **$topic**.
+
+## Main Points
+1. Key point one
+2. Key point two
+3. Key point three
+
+## Outro
+Thanks for watching.
+"""
+)
+
+# Placeholder cover, filled with %-formatting (topic, format, target seconds, job id).
+_COVER_SVG_TMPL: Final[bytes] = b"""<?xml version="1.0" encoding="UTF-8"?>
+<svg xmlns="http://www.w3.org/2000/svg" width="1280" height="720" viewBox="0 0 1280 720">
+  <rect width="1280" height="720" fill="#111"/>
+  <text x="64" y="120" fill="#fff" font-size="64" font-family="Arial, Helvetica, sans-serif">Sleepy Factory</text>
+  <text x="64" y="200" fill="#bbb" font-size="34" font-family="Arial, Helvetica, sans-serif">Topic: %b</text>
+  <text x="64" y="250" fill="#aaa" font-size="28" font-family="Arial, Helvetica, sans-serif">Format: %b</text>
+  <text x="64" y="300" fill="#888" font-size="24" font-family="Arial, Helvetica, sans-serif">Target: %ds</text>
+  <text x="64" y="350" fill="#666" font-size="20" font-family="Arial, Helvetica, sans-serif">Job: %b</text>
+</svg>
+"""
+
+
+_STAGE_FIELDS: Final[dict[str, tuple[str, str, str]]] = {
+    stage: (f"{stage}_status", f"{stage}_lease_owner", f"{stage}_lease_expires_at")
+    for stage in STAGES
+}
+
+
+class StageCols(NamedTuple):
+    """Mapped Job columns for one stage; usable in where() and as values() keys."""
+
+    status: InstrumentedAttribute[StageStatus]
+    lease_owner: InstrumentedAttribute[str | None]
+    lease_expires_at: InstrumentedAttribute[datetime | None]
+
+
+STAGE_COLS: Final[dict[str, StageCols]] = {
+    stage: StageCols(*(getattr(Job, f) for f in fields)) for stage, fields in _STAGE_FIELDS.items()
+}
+
 
 def stage_fields(stage: str) -> tuple[str, str, str]:
+    return _STAGE_FIELDS[stage]
+
+
+def _build_orchestrator_tick_stmt() -> Update:
+    values: dict[Any, Any] = {}
+    ready_predicates = []
+    # RETURNING sees the updated row: the stage that moved is the one now READY with its
+    # predecessor DONE (an earlier stage can't still be READY once a later one is gated open).
+    moved_when: dict[str, Any] = {}
+    prev_status_col = None
+    for stage in STAGES:
+        status_col = STAGE_COLS[stage].status
+        ready = status_col == StageStatus.NEW
+        moved = status_col == StageStatus.READY
+        if prev_status_col is not None:
+            ready = and_(ready, prev_status_col == StageStatus.DONE)
+            moved = and_(moved, prev_status_col == StageStatus.DONE)
+        values[status_col] = case((ready, StageStatus.READY), else_=status_col)
+        ready_predicates.append(ready)
+        moved_when[stage] = moved
+        prev_status_col = status_col
+
     return (
-        f"{stage}_status",
-        f"{stage}_lease_owner",
-        f"{stage}_lease_expires_at",
+        update(Job)
+        .where(or_(*ready_predicates))
+        .values(values)
+        # Wake only the stages that got work; Postgres folds the per-row duplicates into
+        # one notification per stage, delivered on commit.
+        .returning(Job.id, *notify_columns_when(moved_when))
+        .execution_options(synchronize_session=False)
     )
 
 
+_ORCHESTRATOR_TICK_STMT: Final[Update] = _build_orchestrator_tick_stmt()
+
+
 def orchestrator_tick(db: Session) -> int:
     """
     Orchestrator owns stage transitions:
@@ -56,48 +192,10 @@ def orchestrator_tick(db: Session) -> int:
     visuals: NEW -> READY (only when audio DONE)
     render:  NEW -> READY (only when visuals DONE)
     """
-    moved = 0
-
-    jobs = list(
-        db.execute(select(Job).where(Job.script_status == StageStatus.NEW).limit(50)).scalars()
-    )
-    for job in jobs:
-        job.script_status = StageStatus.READY
-        moved += 1
-
-    jobs = list(
-        db.execute(
-            select(Job)
-            .where(Job.script_status == StageStatus.DONE, Job.audio_status == StageStatus.NEW)
-            .limit(50)
-        ).scalars()
-    )
-    for job in jobs:
-        job.audio_status = StageStatus.READY
-        moved += 1
-
-    jobs = list(
-        db.execute(
-            select(Job)
-            .where(Job.audio_status == StageStatus.DONE, Job.visuals_status == StageStatus.NEW)
-            .limit(50)
-        ).scalars()
-    )
-    for job in jobs:
-        job.visuals_status = StageStatus.READY
-        moved += 1
-
-    jobs = list(
-        db.execute(
-            select(Job)
-            .where(Job.visuals_status == StageStatus.DONE, Job.render_status == StageStatus.NEW)
-            .limit(50)
-        ).scalars()
-    )
-    for job in jobs:
-        job.render_status = StageStatus.READY
-        moved += 1
-
+    # One statement for all transitions. CASE sees the pre-update row, so a stage never
+    # becomes READY in the same tick its predecessor did (same as one UPDATE per stage).
+    # A job has at most one stage at NEW with its predecessor DONE, so rows == moves.
+    moved = len(db.execute(_ORCHESTRATOR_TICK_STMT).all())
     db.commit()
     return moved
 
@@ -115,48 +213,153 @@ def claim_one_job_for_stage(
     - Only mutate stage fields and lease fields here.
     - Do NOT increment job-level counters here (attempts is per job run, not per stage claim).
     """
-    now = datetime.now(UTC)
+    jobs = claim_batch_for_stage(db, stage, owner, batch=1, lease_minutes=lease_minutes)
+    return jobs[0] if jobs else None
+
 
-    status_field, lease_owner_field, lease_expires_field = stage_fields(stage)
-    status_col = getattr(Job, status_field)
+def _build_claim_stmt(stage: str) -> Update:
+    cols = STAGE_COLS[stage]
 
-    q = (
-        select(Job)
-        .where(status_col == StageStatus.READY)
+    # One round-trip: pick READY rows under SKIP LOCKED and flip them to RUNNING in the same
+    # statement, so the row locks are never held across Python code. Oldest jobs first.
+    candidates = (
+        select(Job.id)
+        .where(cols.status == StageStatus.READY)
+        .order_by(Job.created_at)
         .with_for_update(skip_locked=True)
-        .limit(1)
+        .limit(bindparam("batch"))
+    )
+    return (
+        update(Job)
+        .where(Job.id.in_(candidates))
+        .values(
+            {
+                cols.status: StageStatus.RUNNING,
+                cols.lease_owner: bindparam("owner"),
+                # Lease times come from the DB clock (claim and recovery alike), so app/DB
+                # clock skew can never expire a lease early.
+                cols.lease_expires_at: func.now()
+                + func.make_interval(0, 0, 0, 0, 0, bindparam("lease_minutes", type_=Integer)),
+                "last_error": None,
+            }
+        )
+        .returning(Job)
+        .execution_options(synchronize_session=False)
     )
 
-    job = db.execute(q).scalars().first()
-    if not job:
-        return None
 
-    setattr(job, status_field, StageStatus.RUNNING)
-    setattr(job, lease_owner_field, owner)
-    setattr(job, lease_expires_field, Job.new_lease_expiry(now, minutes=lease_minutes))
+# Hot-path statements are built once per stage; calls only bind parameters.
+_CLAIM_STMTS: Final[dict[str, Update]] = {stage: _build_claim_stmt(stage) for stage in STAGES}
+
+
+def claim_batch_for_stage(
+    db: Session,
+    stage: str,
+    owner: str,
+    batch: int = 8,
+    lease_minutes: int = 10,
+) -> list[Job]:
+    """
+    Claim up to `batch` READY jobs for `stage` in one statement (same rules as
+    claim_one_job_for_stage). Returned jobs are detached and fully loaded.
+    """
+    params = {"batch": batch, "owner": owner, "lease_minutes": lease_minutes}
+
+    jobs = list(db.execute(_CLAIM_STMTS[stage], params).scalars())
+    for job in jobs:
+        # RETURNING already loaded every column; detach so the commit doesn't expire them.
+        db.expunge(job)
+
+    db.commit()
+    return jobs
+
 
-    job.last_error = None
+def release_job_stages(db: Session, job_ids: list[uuid.UUID], owner: str, stage: str) -> int:
+    """Hand claimed-but-unstarted jobs back to READY (only those `owner` still holds)."""
+    if not job_ids:
+        return 0
 
+    cols = STAGE_COLS[stage]
+    result = db.execute(
+        update(Job)
+        .where(
+            Job.id.in_(job_ids),
+            cols.status == StageStatus.RUNNING,
+            cols.lease_owner == owner,
+        )
+        .values(
+            {cols.status: StageStatus.READY, cols.lease_owner: None, cols.lease_expires_at: None}
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount:
+        # Idle workers may be in a long backoff; tell them the jobs are back.
+        notify(db, stage)
     db.commit()
-    db.refresh(job)
-    return job
+    return result.rowcount
 
 
+@functools.cache
 def _ffmpeg() -> str | None:
+    # PATH doesn't change under a running worker; look it up once per process.
     return shutil.which("ffmpeg")
 
 
 def _run_ffmpeg(cmd: list[str]) -> None:
-    proc = subprocess.run(cmd, check=False, capture_output=True, text=True)
-    if proc.returncode != 0:
-        stderr = (proc.stderr or "").strip()
-        stdout = (proc.stdout or "").strip()
-        msg = "ffmpeg failed"
-        if stderr:
-            msg += f"\n\nstderr:\n{stderr}"
-        if stdout:
-            msg += f"\n\nstdout:\n{stdout}"
-        raise RuntimeError(msg)
+    # stderr goes to an unbuffered temp file rather than a pipe: nothing accumulates in our
+    # memory however chatty ffmpeg gets, and only the tail is read back, on failure.
+    # No preexec_fn/cwd/process_group/new session, so CPython can posix_spawn() instead of
+    # fork()ing this (possibly large) worker process.
+    with tempfile.TemporaryFile() as stderr_file:
+        proc = subprocess.run(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=stderr_file,
+            check=False,
+        )
+        if proc.returncode == 0:
+            return
+
+        size = stderr_file.seek(0, os.SEEK_END)
+        stderr_file.seek(max(0, size - _FFMPEG_STDERR_TAIL_BYTES))
+        stderr = stderr_file.read().decode("utf-8", errors="replace").strip()
+
+    msg = f"ffmpeg failed (exit {proc.returncode})"
+    if stderr:
+        msg += f"\n\nstderr:\n{stderr}"
+    raise RuntimeError(msg)
+
+
+def _wav_header(nchannels: int, sampwidth: int, sample_rate: int, nframes: int) -> bytes:
+    """44-byte canonical RIFF/WAVE header for uncompressed PCM."""
+    data_size = nframes * nchannels * sampwidth
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + data_size,
+        b"WAVE",
+        b"fmt ",
+        16,  # fmt chunk size
+        1,  # WAVE_FORMAT_PCM
+        nchannels,
+        sample_rate,
+        sample_rate * nchannels * sampwidth,  # byte rate
+        nchannels * sampwidth,  # block align
+        sampwidth * 8,
+        b"data",
+        data_size,
+    )
+
+
+@functools.cache
+def _silent_wav(seconds: int) -> bytes:
+    # Placeholder audio only depends on its (clamped) length, so each worker process builds
+    # at most MAX_PLACEHOLDER_AUDIO_SECONDS distinct files, once. Silence is all-zero PCM,
+    # so the file is just a header plus one zero-filled buffer.
+    nframes = _AUDIO_SAMPLE_RATE * seconds
+    header = _wav_header(_AUDIO_CHANNELS, _AUDIO_SAMPWIDTH, _AUDIO_SAMPLE_RATE, nframes)
+    return header + bytes(nframes * _AUDIO_CHANNELS * _AUDIO_SAMPWIDTH)
 
 
 def _load_spec(job_id: str) -> dict[str, Any]:
@@ -189,6 +392,12 @@ def _load_spec(job_id: str) -> dict[str, Any]:
 
 
 def run_stage_work(job_id: str, stage: str) -> None:
+    # One manifest write per stage, no matter how many artifacts the stage produces.
+    with manifest_batch(job_id):
+        _run_stage_work(job_id, stage)
+
+
+def _run_stage_work(job_id: str, stage: str) -> None:
     spec = _load_spec(job_id)
     topic = spec["topic"]
     video_format = spec["format"]
@@ -197,22 +406,13 @@ def run_stage_work(job_id: str, stage: str) -> None:
     created_at = spec["created_at"]
 
     if stage == "script":
-        script_md = (
-            f"# Video Script: {topic}\n\n"
-            "## Metadata\n"
-            f"- Format: {video_format}\n"
-            f"- Target length: {requested_length_seconds} seconds\n"
-            f"- Voice: {voice}\n"
-            f"- Spec created_at: {created_at}\n\n"
-            "## Hook\n"
-            f"Today we're talking about: **{topic}**.\n\n"
-            "## Main Points\n"
-            "1. Key point one\n"
-            "2. Key point two\n"
-            "3. Key point three\n\n"
-            "## Outro\n"
-            "Thanks for watching.\n"
-        )
+        script_md = _SCRIPT_MD_TMPL.substitute(
+            topic=topic,
+            video_format=video_format,
+            length_seconds=requested_length_seconds,
+            voice=voice,
+            created_at=created_at,
+        ).encode("utf-8")
 
         script_obj = {
             "version": "0.1",
@@ -230,7 +430,7 @@ def run_stage_work(job_id: str, stage: str) -> None:
             ],
         }
 
-        write_text(job_id, "script", "script.md", script_md, kind="script_markdown")
+        write_bytes(job_id, "script", "script.md", script_md, kind="script_markdown")
         write_json(job_id, "script", "script.json", script_obj, kind="script_structured")
         write_json(
             job_id,
@@ -250,22 +450,8 @@ def run_stage_work(job_id: str, stage: str) -> None:
 
     if stage == "audio":
         produced_seconds = max(1, min(requested_length_seconds, MAX_PLACEHOLDER_AUDIO_SECONDS))
-        sample_rate = 48_000
-        nchannels = 2
-        sampwidth = 2  # 16-bit PCM
-        nframes = sample_rate * produced_seconds
-
-        buf = io.BytesIO()
-        with wave.open(buf, "wb") as wf:
-            wf.setnchannels(nchannels)
-            wf.setsampwidth(sampwidth)
-            wf.setframerate(sample_rate)
-
-            silence_sample = struct.pack("<h", 0)  # int16
-            silence_frame = silence_sample * nchannels
-            wf.writeframes(silence_frame * nframes)
-
-        write_bytes(job_id, "audio", "audio.wav", buf.getvalue(), kind="audio_wav")
+        write_bytes(job_id, "audio", "audio.wav", _silent_wav(produced_seconds), kind="audio_wav")
+
         write_json(
             job_id,
             "audio",
@@ -278,8 +464,8 @@ def run_stage_work(job_id: str, stage: str) -> None:
                 "requested_length_seconds": requested_length_seconds,
                 "produced_length_seconds": produced_seconds,
                 "format_out": "wav",
-                "sample_rate": sample_rate,
-                "channels": nchannels,
+                "sample_rate": _AUDIO_SAMPLE_RATE,
+                "channels": _AUDIO_CHANNELS,
                 "output": "audio.wav",
             },
             kind="audio_plan",
@@ -287,17 +473,13 @@ def run_stage_work(job_id: str, stage: str) -> None:
         return
 
     if stage == "visuals":
-        svg = f"""<?xml version="1.0" encoding="UTF-8"?>
-<svg xmlns="http://www.w3.org/2000/svg" width="1280" height="720" viewBox="0 0 1280 720">
-  <rect width="1280" height="720" fill="#111"/>
-  <text x="64" y="120" fill="#fff" font-size="64" font-family="Arial, Helvetica, sans-serif">Sleepy Factory</text>
-  <text x="64" y="200" fill="#bbb" font-size="34" font-family="Arial, Helvetica, sans-serif">Topic: {topic}</text>
-  <text x="64" y="250" fill="#aaa" font-size="28" font-family="Arial, Helvetica, sans-serif">Format: {video_format}</text>
-  <text x="64" y="300" fill="#888" font-size="24" font-family="Arial, Helvetica, sans-serif">Target: {requested_length_seconds}s</text>
-  <text x="64" y="350" fill="#666" font-size="20" font-family="Arial, Helvetica, sans-serif">Job: {job_id}</text>
-</svg>
-"""
-        write_text(job_id, "visuals", "cover.svg", svg, kind="visuals_svg")
+        svg = _COVER_SVG_TMPL % (
+            topic.encode("utf-8"),
+            video_format.encode("utf-8"),
+            requested_length_seconds,
+            job_id.encode("utf-8"),
+        )
+        write_bytes(job_id, "visuals", "cover.svg", svg, kind="visuals_svg")
         write_json(
             job_id,
             "visuals",
@@ -342,13 +524,21 @@ def run_stage_work(job_id: str, stage: str) -> None:
             )
             return
 
-        tmp_file = tempfile.NamedTemporaryFile(suffix=".mp4", delete=False)
+        # Encode straight into the stage dir so the result can be renamed into place.
+        tmp_file = tempfile.NamedTemporaryFile(
+            dir=stage_dir(job_id, "render"), suffix=".mp4", delete=False
+        )
         tmp_path = Path(tmp_file.name)
         tmp_file.close()
 
         try:
             cmd = [
                 ffmpeg,
+                # Never read the terminal, and keep stderr down to real errors.
+                "-nostdin",
+                "-hide_banner",
+                "-loglevel",
+                "error",
                 "-y",
                 "-f",
                 "lavfi",
@@ -365,12 +555,12 @@ def run_stage_work(job_id: str, stage: str) -> None:
                 "yuv420p",
                 "-c:a",
                 "aac",
+                *(["-threads", str(FFMPEG_THREADS)] if FFMPEG_THREADS else []),
                 str(tmp_path),
             ]
             _run_ffmpeg(cmd)
 
-            data = tmp_path.read_bytes()
-            write_bytes(job_id, "render", "final.mp4", data, kind="final_video")
+            write_path(job_id, "render", "final.mp4", tmp_path, kind="final_video")
             write_json(
                 job_id,
                 "render",
@@ -393,6 +583,35 @@ def run_stage_work(job_id: str, stage: str) -> None:
     return
 
 
+def _build_complete_stmt(stage: str) -> Update:
+    cols = STAGE_COLS[stage]
+
+    # Compare-and-set in one statement: only the current lease holder of a RUNNING stage
+    # can complete it. A stolen or re-queued lease simply matches no row.
+    return (
+        update(Job)
+        .where(
+            Job.id == bindparam("job_id"),
+            cols.status == StageStatus.RUNNING,
+            cols.lease_owner == bindparam("owner"),
+        )
+        .values(
+            {
+                cols.status: bindparam("new_status"),
+                cols.lease_owner: None,
+                cols.lease_expires_at: None,
+                "last_error": bindparam("last_error"),
+            }
+        )
+        # A finished stage may unblock the next one: wake the orchestrator (on commit).
+        .returning(Job.id, *notify_columns(ORCHESTRATOR))
+        .execution_options(synchronize_session=False)
+    )
+
+
+_COMPLETE_STMTS: Final[dict[str, Update]] = {stage: _build_complete_stmt(stage) for stage in STAGES}
+
+
 def complete_job_stage(
     db: Session,
     job_id,
@@ -401,60 +620,164 @@ def complete_job_stage(
     success: bool,
     error: str | None = None,
 ) -> bool:
-    status_field, lease_owner_field, lease_expires_field = stage_fields(stage)
+    params = {
+        "job_id": job_id,
+        "owner": owner,
+        "new_status": StageStatus.DONE if success else StageStatus.ERROR,
+        "last_error": None if success else (error or "unknown error"),
+    }
+    completed = db.execute(_COMPLETE_STMTS[stage], params).first() is not None
 
-    q = select(Job).where(Job.id == job_id).with_for_update()
-    job = db.execute(q).scalars().first()
-    if not job:
-        return False
+    db.commit()
+    return completed
 
-    if getattr(job, status_field) != StageStatus.RUNNING:
-        return False
 
-    if getattr(job, lease_owner_field) != owner:
-        return False
+def _build_complete_done_stmt(stage: str) -> Update:
+    cols = STAGE_COLS[stage]
 
-    setattr(job, status_field, StageStatus.DONE if success else StageStatus.ERROR)
-    job.last_error = None if success else (error or "unknown error")
+    return (
+        update(Job)
+        .where(
+            Job.id.in_(bindparam("job_ids", expanding=True)),
+            cols.status == StageStatus.RUNNING,
+            cols.lease_owner == bindparam("owner"),
+        )
+        .values(
+            {
+                cols.status: StageStatus.DONE,
+                cols.lease_owner: None,
+                cols.lease_expires_at: None,
+                "last_error": None,
+            }
+        )
+        .returning(Job.id, *notify_columns(ORCHESTRATOR))
+        .execution_options(synchronize_session=False)
+    )
+
+
+_COMPLETE_DONE_STMTS: Final[dict[str, Update]] = {
+    stage: _build_complete_done_stmt(stage) for stage in STAGES
+}
 
-    setattr(job, lease_owner_field, None)
-    setattr(job, lease_expires_field, None)
+
+def complete_job_stages_done(
+    db: Session, job_ids: list[uuid.UUID], owner: str, stage: str
+) -> set[uuid.UUID]:
+    """
+    Mark several successful stages DONE in one statement (same compare-and-set rules as
+    complete_job_stage). Returns the ids that were actually completed.
+    """
+    if not job_ids:
+        return set()
+
+    params = {"job_ids": job_ids, "owner": owner}
+    completed = set(db.execute(_COMPLETE_DONE_STMTS[stage], params).scalars())
 
     db.commit()
-    return True
+    return completed
 
 
 def run_worker_loop(
-    stage: str, poll_seconds: float = 1.0, stop_event: threading.Event | None = None
+    stage: str,
+    poll_seconds: float = 1.0,
+    stop_event: threading.Event | None = None,
+    executor: Executor | None = None,
 ) -> None:
+    """
+    Claim -> work -> complete loop for one stage.
+
+    With an `executor`, stage work runs there (e.g. a process pool) while this thread only
+    talks to the DB; otherwise it runs inline.
+    """
     if stop_event is None:
         stop_event = threading.Event()
 
     owner = f"{socket.gethostname()}:{os.getpid()}:{stage}"
-    print(f"[bold]Worker starting[/bold] ({stage}) as {owner}")
+    log.info("Worker starting (%s) as %s", stage, owner)
+
+    idle_wait = poll_seconds
+    # One session for the worker's lifetime; every helper below ends its own transaction.
+    with Listener({stage}, stop_event) as listener, LeaseSessionLocal() as db:
+        while not stop_event.is_set():
+            try:
+                jobs = claim_batch_for_stage(db, stage, owner=owner, batch=CLAIM_BATCH[stage])
+                if not jobs:
+                    # Woken early when the orchestrator releases work for this stage. While
+                    # notifications arrive, the poll only catches missed ones: back off.
+                    if listener.wait(idle_wait) or not listener.connected:
+                        idle_wait = poll_seconds
+                    else:
+                        idle_wait = min(idle_wait * 2, max(poll_seconds, IDLE_POLL_MAX_SECONDS))
+                    continue
+                idle_wait = poll_seconds
+
+                succeeded: list[uuid.UUID] = []
+                try:
+                    for i, job in enumerate(jobs):
+                        if stop_event.is_set():
+                            # Don't sit on leases we won't get to; let another worker take them now.
+                            release_job_stages(db, [j.id for j in jobs[i:]], owner, stage)
+                            break
+                        try:
+                            err = _run_claimed_job(job, stage, executor)
+                        except BrokenProcessPool:
+                            # The pool died under this job (not necessarily because of it): hand
+                            # it and the rest of the batch back; the next submit gets a new pool.
+                            log.warning("[%s] Process pool broke running job %s", stage, job.id)
+                            release_job_stages(db, [j.id for j in jobs[i:]], owner, stage)
+                            break
+                        if err is None:
+                            succeeded.append(job.id)
+                        else:
+                            ok = complete_job_stage(
+                                db, job.id, owner=owner, stage=stage, success=False, error=err
+                            )
+                            log.info("[%s] Completed job %s: %s (success=False)", stage, job.id, ok)
+                finally:
+                    # Successes are completed together, in one UPDATE, even when a DB error
+                    # cut the batch short: finished work must not wait out its lease.
+                    _complete_succeeded(db, succeeded, owner, stage)
+            except SQLAlchemyError as exc:
+                # Leases we still hold expire and get recovered; just keep polling.
+                _rollback_after_db_error(db, f"{stage} worker", exc)
+                listener.wait(poll_seconds)
+
+
+def _complete_succeeded(db: Session, job_ids: list[uuid.UUID], owner: str, stage: str) -> None:
+    if not job_ids:
+        return
 
-    while not stop_event.is_set():
-        with SessionLocal() as db:
-            job = claim_one_job_for_stage(db, stage=stage, owner=owner)
-            if not job:
-                stop_event.wait(poll_seconds)
-                continue
+    # Every helper commits its own work, so this only discards a transaction a DB error left
+    # failed (a no-op otherwise).
+    db.rollback()
+    completed = complete_job_stages_done(db, job_ids, owner, stage)
+    for job_id in job_ids:
+        ok = job_id in completed
+        log.info("[%s] Completed job %s: %s (success=True)", stage, job_id, ok)
 
-        print(f"[{stage}] Claimed job {job.id} (job_runs={job.attempts})")
 
-        try:
-            run_stage_work(str(job.id), stage)
-            success = True
-            err: str | None = None
-        except Exception as exc:  # noqa: BLE001
-            success = False
-            err = f"{type(exc).__name__}: {exc}"
+def _rollback_after_db_error(db: Session, loop_name: str, exc: SQLAlchemyError) -> None:
+    db.rollback()
+    log.warning("Database error in %s loop (will retry): %s", loop_name, exc)
 
-        with SessionLocal() as db:
-            ok = complete_job_stage(
-                db, job.id, owner=owner, stage=stage, success=success, error=err
-            )
-            print(f"[{stage}] Completed job {job.id}: {ok} (success={success})")
+
+def _run_claimed_job(job: Job, stage: str, executor: Executor | None) -> str | None:
+    """
+    Run one claimed stage; returns an error message, or None on success. BrokenProcessPool
+    propagates: it says nothing about the job, so the caller hands the lease back instead.
+    """
+    log.info("[%s] Claimed job %s (job_runs=%d)", stage, job.id, job.attempts)
+
+    try:
+        if executor is None:
+            run_stage_work(str(job.id), stage)
+        else:
+            executor.submit(run_stage_work, str(job.id), stage).result()
+    except BrokenProcessPool:
+        raise
+    except Exception as exc:  # noqa: BLE001
+        return f"{type(exc).__name__}: {exc}"
+    return None
 
 
 def run_orchestrator_loop(
@@ -463,48 +786,78 @@ def run_orchestrator_loop(
     if stop_event is None:
         stop_event = threading.Event()
 
-    print("[bold]Orchestrator loop starting[/bold]")
-    while not stop_event.is_set():
-        with SessionLocal() as db:
-            moved = orchestrator_tick(db)
-        if moved:
-            print(f"[orchestrator] moved {moved} stage transitions to READY")
-        stop_event.wait(poll_seconds)
+    log.info("Orchestrator loop starting")
+    with Listener({ORCHESTRATOR}, stop_event) as listener, LeaseSessionLocal() as db:
+        dirty = True
+        last_tick = 0.0
+        while not stop_event.is_set():
+            # Job creation and stage completion notify us, so a quiet wait means there is
+            # nothing to move. Still tick every ORCHESTRATOR_RESYNC_SECONDS in case a
+            # notification was lost, and on every poll when we can't LISTEN at all.
+            failed = False
+            if (
+                dirty
+                or not listener.connected
+                or time.monotonic() - last_tick >= ORCHESTRATOR_RESYNC_SECONDS
+            ):
+                last_tick = time.monotonic()
+                try:
+                    moved = orchestrator_tick(db)
+                except SQLAlchemyError as exc:
+                    _rollback_after_db_error(db, "orchestrator", exc)
+                    moved = 0
+                    failed = True
+                if moved:
+                    log.info("[orchestrator] moved %d stage transitions to READY", moved)
+            # A failed tick moved nothing and its wakeup is spent: retry after the wait.
+            dirty = listener.wait(poll_seconds) or failed
+
+
+def _build_recover_stmt(stage: str) -> Update:
+    cols = STAGE_COLS[stage]
+
+    expired = (
+        select(Job.id)
+        .where(
+            cols.status == StageStatus.RUNNING,
+            cols.lease_expires_at.is_not(None),
+            cols.lease_expires_at < func.now(),
+        )
+        .with_for_update(skip_locked=True)
+        .limit(bindparam("limit"))
+    )
+    return (
+        update(Job)
+        .where(Job.id.in_(expired))
+        .values(
+            {
+                cols.status: StageStatus.READY,
+                cols.lease_owner: None,
+                cols.lease_expires_at: None,
+                "last_error": f"lease expired, re-queued {stage}",
+            }
+        )
+        # Re-queued work is READY again: wake this stage's workers (on commit).
+        .returning(Job.id, *notify_columns(stage))
+        .execution_options(synchronize_session=False)
+    )
 
 
-def recover_expired_leases(db: Session, limit: int = 50) -> int:
-    now = datetime.now(UTC)
+_RECOVER_STMTS: Final[dict[str, Update]] = {stage: _build_recover_stmt(stage) for stage in STAGES}
 
-    conditions = []
-    for stage in STAGES:
-        status_field, _, lease_expires_field = stage_fields(stage)
-        conditions.append(
-            and_(
-                getattr(Job, status_field) == StageStatus.RUNNING,
-                getattr(Job, lease_expires_field).is_not(None),
-                getattr(Job, lease_expires_field) < now,
-            )
-        )
 
-    q = select(Job).where(or_(*conditions)).with_for_update(skip_locked=True).limit(limit)
+def recover_expired_leases(db: Session, limit: int = 50) -> int:
+    """
+    Re-queue RUNNING stages whose lease expired (at most `limit` jobs per stage per call).
 
-    jobs = list(db.execute(q).scalars())
+    One set-based UPDATE per stage; rows a live worker currently has locked are skipped and
+    picked up on a later pass.
+    """
+    params = {"limit": limit}
     recovered = 0
 
-    for job in jobs:
-        for stage in STAGES:
-            status_field, lease_owner_field, lease_expires_field = stage_fields(stage)
-            if getattr(job, status_field) != StageStatus.RUNNING:
-                continue
-
-            exp = getattr(job, lease_expires_field)
-            if exp is not None and exp < now:
-                setattr(job, status_field, StageStatus.READY)
-                job.last_error = f"lease expired, re-queued {stage}"
-                setattr(job, lease_owner_field, None)
-                setattr(job, lease_expires_field, None)
-                recovered += 1
-                break
+    for stage in STAGES:
+        recovered += len(db.execute(_RECOVER_STMTS[stage], params).all())
 
     db.commit()
     return recovered
@@ -514,54 +867,100 @@ def run_recovery_loop(poll_seconds: float = 5.0, stop_event: threading.Event | N
     if stop_event is None:
         stop_event = threading.Event()
 
-    print("[bold]Recovery loop starting[/bold]")
-    while not stop_event.is_set():
-        with SessionLocal() as db:
-            n = recover_expired_leases(db)
-        if n:
-            print(f"[recovery] recovered {n} jobs with expired leases")
-        stop_event.wait(poll_seconds)
+    log.info("Recovery loop starting")
+    with LeaseSessionLocal() as db:
+        while not stop_event.is_set():
+            try:
+                n = recover_expired_leases(db)
+            except SQLAlchemyError as exc:
+                _rollback_after_db_error(db, "recovery", exc)
+                n = 0
+            if n:
+                log.info("[recovery] recovered %d jobs with expired leases", n)
+            stop_event.wait(poll_seconds)
+
+
+_STATUS_COLS: Final = tuple(cols.status for cols in STAGE_COLS.values())
+
+
+def create_new_jobs(db: Session, job_ids: list[uuid.UUID]) -> list[Row[Any]]:
+    """
+    Insert jobs with the given ids in one round-trip; return (id, *stage statuses) per job.
 
+    Core INSERT ... RETURNING skips the unit of work and the refresh SELECT. The caller
+    commits, which is also when the orchestrator is woken: write each job's spec first.
+    """
+    if not job_ids:
+        return []
+    # attempts == job runs (per job), not per stage claim
+    rows = db.execute(
+        insert(Job).returning(Job.id, *_STATUS_COLS),
+        [{"id": job_id, "attempts": 1} for job_id in job_ids],
+    ).all()
+    notify(db, ORCHESTRATOR)
+    return rows
+
+
+def create_new_job(
+    topic: str, video_format: str, length_seconds: int, voice: str, count: int = 1
+) -> None:
+    job_ids = [uuid.uuid4() for _ in range(count)]
+
+    # Specs go to disk before the rows exist: once committed, a worker may claim the
+    # script stage immediately, and it must find the spec it is meant to run.
+    created_at = datetime.now(UTC).isoformat()
+    for job_id in job_ids:
+        spec = {
+            "job_id": str(job_id),
+            "topic": topic,
+            "format": video_format,
+            "length_seconds": int(length_seconds),
+            "voice": voice,
+            "created_at": created_at,
+        }
+        write_job_spec(str(job_id), spec)
 
-def create_new_job(topic: str, video_format: str, length_seconds: int, voice: str) -> None:
     with SessionLocal() as db:
-        job = Job()
-        job.attempts = 1  # attempts == job runs (per job), not per stage claim
-        db.add(job)
+        rows = create_new_jobs(db, job_ids)
         db.commit()
-        db.refresh(job)
 
-    spec = {
-        "job_id": str(job.id),
-        "topic": topic,
-        "format": video_format,
-        "length_seconds": int(length_seconds),
-        "voice": voice,
-        "created_at": datetime.now(UTC).isoformat(),
-    }
-    write_job_spec(str(job.id), spec)
-
-    print(
-        "Created job "
-        f"{job.id} (script={job.script_status}, audio={job.audio_status}, visuals={job.visuals_status}, "
-        f"render={job.render_status})"
-    )
+    for job_id, *statuses in rows:
+        described = ", ".join(f"{st}={status}" for st, status in zip(STAGES, statuses, strict=True))
+        print(f"Created job {job_id} ({described})")
 
 
 def list_jobs(limit: int = 20) -> None:
     with SessionLocal() as db:
-        q = select(Job).order_by(Job.created_at.desc()).limit(limit)
-        jobs = list(db.execute(q).scalars())
-
-    for j in jobs:
-        print(
+        # Only the displayed columns: plain rows, no ORM objects to hydrate.
+        q = (
+            select(
+                Job.id,
+                Job.script_status,
+                Job.script_lease_owner,
+                Job.audio_status,
+                Job.audio_lease_owner,
+                Job.visuals_status,
+                Job.visuals_lease_owner,
+                Job.render_status,
+                Job.render_lease_owner,
+                Job.attempts,
+            )
+            .order_by(Job.created_at.desc())
+            .limit(limit)
+        )
+        # Build every line, then print once: one markup pass instead of one per job.
+        lines = [
             f"{j.id}  "
             f"script={j.script_status}({j.script_lease_owner})  "
             f"audio={j.audio_status}({j.audio_lease_owner})  "
             f"visuals={j.visuals_status}({j.visuals_lease_owner})  "
             f"render={j.render_status}({j.render_lease_owner})  "
             f"job_runs={j.attempts}"
-        )
+            for j in db.execute(q)
+        ]
+
+    if lines:
+        print("\n".join(lines))
 
 
 def show_job(job_id: str) -> None:
@@ -602,13 +1001,15 @@ def show_job(job_id: str) -> None:
             if k in spec:
                 print(f"  {k}: {spec.get(k)}")
 
+    # Read-only: includes records a running worker has only logged so far, without
+    # rewriting manifest.json underneath it.
     manifest_path = job_dir(job_id) / "manifest.json"
-    if not manifest_path.exists():
+    manifest = load_manifest(job_id)
+    if not manifest["artifacts"] and not manifest_path.exists():
         print()
         print("[yellow]No manifest found[/yellow] (manifest.json)")
         return
 
-    manifest = load_manifest(job_id)
     artifacts_list = manifest.get("artifacts", [])
     print()
     print(f"[bold]Manifest[/bold] artifacts={len(artifacts_list)}  path={manifest_path}")
@@ -634,9 +1035,47 @@ def clean_artifacts() -> None:
         return
 
     shutil.rmtree(ARTIFACTS_ROOT)
+    reset_caches()
     print(f"[green]Deleted artifacts directory:[/green] {ARTIFACTS_ROOT}")
 
 
+def _ignore_sigint() -> None:
+    # Pool processes share our terminal; let the parent handle Ctrl+C and shut them down.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+class _SelfHealingProcessPool(Executor):
+    """
+    Process pool shared by several worker threads that replaces itself once broken.
+
+    A worker process dying (OOM kill, segfault) breaks a ProcessPoolExecutor for good; the
+    next submit() after that swaps in a fresh pool, under a lock so concurrent submitters
+    rebuild it only once.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        self._max_workers = max_workers
+        self._lock = threading.Lock()
+        self._pool = self._new_pool()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self._max_workers, initializer=_ignore_sigint)
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        with self._lock:
+            try:
+                return self._pool.submit(fn, *args, **kwargs)
+            except BrokenProcessPool:
+                log.warning("Process pool broke; starting a new one")
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = self._new_pool()
+                return self._pool.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        with self._lock:
+            self._pool.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
 def run_dev(orchestrator_poll: float = 1.0, recovery_poll: float = 5.0) -> None:
     stop_event = threading.Event()
 
@@ -653,11 +1092,20 @@ def run_dev(orchestrator_poll: float = 1.0, recovery_poll: float = 5.0) -> None:
         ),
     ]
 
+    # CPU/ffmpeg-heavy stages run in worker processes so they don't contend for the GIL
+    # with the DB-polling threads; the cheap stages stay inline. Each of those stages has one
+    # worker thread running one job at a time, so one process per stage is all it can use.
+    pool = _SelfHealingProcessPool(max_workers=len(PROCESS_POOL_STAGES))
+
     for stage in STAGES:
         threads.append(
             threading.Thread(
                 target=run_worker_loop,
-                kwargs={"stage": stage, "stop_event": stop_event},
+                kwargs={
+                    "stage": stage,
+                    "stop_event": stop_event,
+                    "executor": pool if stage in PROCESS_POOL_STAGES else None,
+                },
                 daemon=True,
             )
         )
@@ -674,9 +1122,22 @@ def run_dev(orchestrator_poll: float = 1.0, recovery_poll: float = 5.0) -> None:
         stop_event.set()
         for t in threads:
             t.join(timeout=2.0)
+        pool.shutdown(wait=False, cancel_futures=True)
         print("[bold]Stopped.[/bold]")
 
 
+def _positive_int(value: str) -> int:
+    import argparse
+
+    try:
+        n = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {n}")
+    return n
+
+
 def main() -> None:
     import argparse
 
@@ -688,6 +1149,7 @@ def main() -> None:
     p_new.add_argument("--format", type=str, default="short", choices=["short", "long", "sleepy"])
     p_new.add_argument("--length-seconds", type=int, default=60)
     p_new.add_argument("--voice", type=str, default="calm")
+    p_new.add_argument("--count", type=_positive_int, default=1)
 
     p_list = sub.add_parser("list-jobs")
     p_list.add_argument("--limit", type=int, default=20)
@@ -714,6 +1176,14 @@ def main() -> None:
 
     args = parser.parse_args()
 
+    # Long-running loops log through one shared handler; one-shot commands still print.
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(message)s",
+        datefmt="[%X]",
+        handlers=[RichHandler(show_path=False)],
+    )
+
     if args.cmd == "dev":
         run_dev(orchestrator_poll=args.orchestrator_poll, recovery_poll=args.recovery_poll)
         return
@@ -732,6 +1202,7 @@ def main() -> None:
             video_format=args.format,
             length_seconds=args.length_seconds,
             voice=args.voice,
+            count=args.count,
         )
         return
 
@@ -13,6 +13,9 @@ load_dotenv(dotenv_path=REPO_ROOT / ".env")
 class Settings(BaseModel):
     database_url: str
 
+    # Optional render tuning; unset lets ffmpeg pick its own thread count.
+    ffmpeg_threads: int | None = None
+
 
 def _require_env(name: str) -> str:
     value = os.environ.get(name)
@@ -32,4 +35,12 @@ def _require_env(name: str) -> str:
     raise RuntimeError(msg)
 
 
-settings = Settings(database_url=_require_env("DATABASE_URL"))
+def _optional_env(name: str) -> str | None:
+    value = os.environ.get(name)
+    return value.strip() if value and value.strip() else None
+
+
+settings = Settings(
+    database_url=_require_env("DATABASE_URL"),
+    ffmpeg_threads=_optional_env("SF_FFMPEG_THREADS"),
+)
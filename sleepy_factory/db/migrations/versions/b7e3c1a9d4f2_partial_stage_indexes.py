@@ -0,0 +1,52 @@
+"""partial indexes for claim and lease recovery
+
+Revision ID: b7e3c1a9d4f2
+Revises: 1767c0f40807
+Create Date: 2026-10-15 10:12:41.208315
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# Revision identifiers, used by Alembic.
+revision: str = "b7e3c1a9d4f2"
+down_revision: str | Sequence[str] | None = "1767c0f40807"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+STAGES = ("script", "audio", "visuals", "render")
+
+
+def upgrade() -> None:
+    for stage in STAGES:
+        # Claim: WHERE <stage>_status = 'READY' ORDER BY created_at LIMIT n only ever touches
+        # READY rows, already in claim order.
+        op.create_index(
+            f"ix_jobs_{stage}_ready",
+            "jobs",
+            ["created_at"],
+            unique=False,
+            postgresql_where=sa.text(f"{stage}_status = 'READY'"),
+        )
+        # Recovery: WHERE <stage>_status = 'RUNNING' AND <stage>_lease_expires_at < now.
+        op.create_index(
+            f"ix_jobs_{stage}_running_expiry",
+            "jobs",
+            [f"{stage}_lease_expires_at"],
+            unique=False,
+            postgresql_where=sa.text(f"{stage}_status = 'RUNNING'"),
+        )
+
+    # list-jobs: ORDER BY created_at DESC LIMIT n (btree scans backwards just fine).
+    op.create_index(op.f("ix_jobs_created_at"), "jobs", ["created_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_jobs_created_at"), table_name="jobs")
+    for stage in reversed(STAGES):
+        op.drop_index(f"ix_jobs_{stage}_running_expiry", table_name="jobs")
+        op.drop_index(f"ix_jobs_{stage}_ready", table_name="jobs")
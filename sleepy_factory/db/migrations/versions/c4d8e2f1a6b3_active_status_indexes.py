@@ -0,0 +1,40 @@
+"""replace full per-stage status indexes with active-only partial indexes
+
+Revision ID: c4d8e2f1a6b3
+Revises: b7e3c1a9d4f2
+Create Date: 2026-10-15 11:02:17.540932
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# Revision identifiers, used by Alembic.
+revision: str = "c4d8e2f1a6b3"
+down_revision: str | Sequence[str] | None = "b7e3c1a9d4f2"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+STAGES = ("script", "audio", "visuals", "render")
+
+
+def upgrade() -> None:
+    for stage in STAGES:
+        # Nothing queries DONE/ERROR rows by status, and they are almost the whole table.
+        op.drop_index(op.f(f"ix_jobs_{stage}_status"), table_name="jobs")
+        op.create_index(
+            f"ix_jobs_{stage}_active",
+            "jobs",
+            [f"{stage}_status"],
+            unique=False,
+            postgresql_where=sa.text(f"{stage}_status IN ('NEW', 'READY', 'RUNNING')"),
+        )
+
+
+def downgrade() -> None:
+    for stage in reversed(STAGES):
+        op.drop_index(f"ix_jobs_{stage}_active", table_name="jobs")
+        op.create_index(op.f(f"ix_jobs_{stage}_status"), "jobs", [f"{stage}_status"], unique=False)
@@ -2,7 +2,7 @@ import enum
 import uuid
 from datetime import UTC, datetime, timedelta
 
-from sqlalchemy import DateTime, Enum, Integer, String, Text, func
+from sqlalchemy import DateTime, Enum, Index, Integer, String, Text, column, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
@@ -21,24 +21,57 @@ class StageStatus(str, enum.Enum):
 
 STATUS_ENUM = Enum(StageStatus, name="stagestatus")
 
+# Pipeline order; each stage has its own <stage>_status/_lease_owner/_lease_expires_at columns.
+STAGES: tuple[str, ...] = ("script", "audio", "visuals", "render")
+
+
+def _stage_indexes() -> tuple[Index, ...]:
+    # Partial indexes sized to the hot queries: the orchestrator only looks at live (NEW/
+    # READY/RUNNING) rows, claims only at READY rows and lease recovery only at RUNNING rows,
+    # so none of them has to wade through the (ever-growing) DONE jobs.
+    indexes: list[Index] = []
+    for stage in STAGES:
+        status = column(f"{stage}_status", STATUS_ENUM)
+        indexes += [
+            Index(
+                f"ix_jobs_{stage}_active",
+                f"{stage}_status",
+                postgresql_where=status.in_(
+                    [StageStatus.NEW, StageStatus.READY, StageStatus.RUNNING]
+                ),
+            ),
+            Index(
+                f"ix_jobs_{stage}_ready",
+                "created_at",
+                postgresql_where=status == StageStatus.READY,
+            ),
+            Index(
+                f"ix_jobs_{stage}_running_expiry",
+                f"{stage}_lease_expires_at",
+                postgresql_where=status == StageStatus.RUNNING,
+            ),
+        ]
+    return tuple(indexes)
+
 
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = _stage_indexes()
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
     # stage statuses
     script_status: Mapped[StageStatus] = mapped_column(
-        STATUS_ENUM, default=StageStatus.NEW, nullable=False, index=True
+        STATUS_ENUM, default=StageStatus.NEW, nullable=False
     )
     audio_status: Mapped[StageStatus] = mapped_column(
-        STATUS_ENUM, default=StageStatus.NEW, nullable=False, index=True
+        STATUS_ENUM, default=StageStatus.NEW, nullable=False
     )
     visuals_status: Mapped[StageStatus] = mapped_column(
-        STATUS_ENUM, default=StageStatus.NEW, nullable=False, index=True
+        STATUS_ENUM, default=StageStatus.NEW, nullable=False
     )
     render_status: Mapped[StageStatus] = mapped_column(
-        STATUS_ENUM, default=StageStatus.NEW, nullable=False, index=True
+        STATUS_ENUM, default=StageStatus.NEW, nullable=False
     )
 
     attempts: Mapped[int] = mapped_column(Integer, default=0)
@@ -67,7 +100,7 @@ class Job(Base):
     last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
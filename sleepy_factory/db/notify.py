@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterable, Mapping
+from contextlib import closing
+from typing import Any, Final
+
+import psycopg
+from sqlalchemy import ColumnElement, case, func, select
+from sqlalchemy.orm import Session
+
+from sleepy_factory.db.session import engine
+
+# One channel for all wakeups; the payload says who should wake up:
+# a stage name ("there may be READY work for this stage") or ORCHESTRATOR.
+CHANNEL: Final[str] = "sf_jobs"
+ORCHESTRATOR: Final[str] = "orchestrator"
+
+# Longest a wait() goes without checking its stop event.
+_STOP_CHECK_SECONDS: Final[float] = 0.5
+
+
+def _supported() -> bool:
+    return engine.dialect.name == "postgresql"
+
+
+def notify(db: Session, *payloads: str) -> None:
+    """
+    Queue wakeups on the current transaction. Postgres delivers them on commit, so
+    listeners never wake up before the rows they are told about are visible.
+    """
+    if not payloads or not _supported():
+        return
+    db.execute(select(*(func.pg_notify(CHANNEL, payload) for payload in payloads)))
+
+
+def notify_columns(*payloads: str) -> tuple[ColumnElement[Any], ...]:
+    """
+    pg_notify() calls to add to an UPDATE's RETURNING clause: the wakeup rides along with
+    the statement instead of costing its own round-trip, and fires only if a row matched.
+    """
+    if not _supported():
+        return ()
+    return tuple(func.pg_notify(CHANNEL, payload) for payload in payloads)
+
+
+def notify_columns_when(
+    conditions: Mapping[str, ColumnElement[bool]],
+) -> tuple[ColumnElement[Any], ...]:
+    """Like notify_columns(), but each payload is sent only for rows matching its condition."""
+    if not _supported():
+        return ()
+    return tuple(
+        case((condition, func.pg_notify(CHANNEL, payload)))
+        for payload, condition in conditions.items()
+    )
+
+
+class Listener:
+    """
+    A dedicated LISTEN connection (outside the SQLAlchemy pool) for one loop.
+
+    wait() blocks until a notification with one of `payloads` arrives or `timeout`
+    passes, so the loop's poll interval becomes a fallback rather than its latency.
+    Without Postgres, or while the connection is down, it degrades to a plain wait.
+    """
+
+    def __init__(self, payloads: Iterable[str], stop_event: threading.Event) -> None:
+        self.payloads = frozenset(payloads)
+        self.stop_event = stop_event
+        self._conn: psycopg.Connection | None = None
+
+    def _connect(self) -> psycopg.Connection | None:
+        if self._conn is None and _supported():
+            conninfo = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+            try:
+                self._conn = psycopg.connect(conninfo, autocommit=True)
+                self._conn.execute(f"LISTEN {CHANNEL}")
+            except psycopg.OperationalError:
+                self.close()
+        return self._conn
+
+    def wait(self, timeout: float) -> bool:
+        """Return True if woken by a notification, False on timeout."""
+        conn = self._connect()
+        if conn is None:
+            self.stop_event.wait(timeout)
+            return False
+
+        deadline = time.monotonic() + timeout
+        while (remaining := deadline - time.monotonic()) > 0 and not self.stop_event.is_set():
+            try:
+                # One commit can carry several payloads in one packet: keep reading until one
+                # is ours rather than judging a packet by its first item. Waits are sliced so
+                # a stop request is noticed promptly.
+                # closing(): the generator holds the connection lock until it is closed.
+                with closing(conn.notifies(timeout=min(remaining, _STOP_CHECK_SECONDS))) as got:
+                    woken = any(n.payload in self.payloads for n in got)
+                if woken:
+                    # Whatever else has already arrived is answered by this wakeup too;
+                    # drain it now so it can't cause a spurious wakeup on a later wait().
+                    for _ in conn.notifies(timeout=0):
+                        pass
+                    return True
+            except psycopg.OperationalError:
+                # Lost the server; poll until the next wait() reconnects.
+                self.close()
+                self.stop_event.wait(max(0.0, deadline - time.monotonic()))
+                return False
+        return False
+
+    @property
+    def connected(self) -> bool:
+        """False until the first wait(), without Postgres, or while reconnecting."""
+        return self._conn is not None
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> Listener:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -1,7 +1,24 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 
 from sleepy_factory.config import settings
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+
+def _make_engine(**connect_args: str) -> Engine:
+    return create_engine(settings.database_url, pool_pre_ping=True, connect_args=connect_args)
+
+
+engine = _make_engine()
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+# For the worker/orchestrator/recovery loops only. Their commits are lease and stage-state
+# transitions that are safe to lose in a server crash (the last ~few hundred ms at most):
+# a lost claim or completion is redone once its lease expires, a lost tick is re-run.
+# So don't make every poll wait for a WAL flush. Job creation stays on SessionLocal.
+lease_engine = (
+    _make_engine(options="-c synchronous_commit=off")
+    if engine.dialect.name == "postgresql"
+    else engine
+)
+LeaseSessionLocal = sessionmaker(bind=lease_engine, autocommit=False, autoflush=False)
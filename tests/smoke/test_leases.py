@@ -0,0 +1,137 @@
+import os
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from sleepy_factory.cli import (
+    complete_job_stage,
+    complete_job_stages_done,
+    recover_expired_leases,
+    release_job_stages,
+)
+from sleepy_factory.db.models import Job, StageStatus
+from sleepy_factory.db.session import SessionLocal
+
+pytestmark = pytest.mark.smoke
+
+
+def test_recover_expired_lease_and_complete_is_compare_and_set() -> None:
+    # If you explicitly run smoke tests, DB should be up. Fail loudly if not.
+    with SessionLocal() as db:
+        db.execute(text("SELECT 1"))
+
+    # A job whose audio worker died: RUNNING with a lease that expired a minute ago.
+    with SessionLocal() as db:
+        job = Job(script_status=StageStatus.DONE, audio_status=StageStatus.RUNNING)
+        job.audio_lease_owner = "someone-else"
+        job.audio_lease_expires_at = datetime.now(UTC) - timedelta(minutes=1)
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        job_id = job.id
+
+    owner = f"pytest:{os.getpid()}:audio"
+
+    try:
+        # Expired lease is re-queued.
+        with SessionLocal() as db:
+            assert recover_expired_leases(db) >= 1
+            j = db.get(Job, job_id)
+            assert j is not None
+            assert j.audio_status == StageStatus.READY
+            assert j.audio_lease_owner is None
+            assert j.audio_lease_expires_at is None
+            assert j.last_error == "lease expired, re-queued audio"
+
+        # "Claim" only this job (avoid claiming other READY jobs), as the pipeline test does.
+        with SessionLocal() as db:
+            j = db.get(Job, job_id)
+            assert j is not None
+            j.audio_status = StageStatus.RUNNING
+            j.audio_lease_owner = owner
+            j.audio_lease_expires_at = Job.new_lease_expiry(datetime.now(UTC))
+            db.commit()
+
+        # Completion is a compare-and-set on status + owner.
+        with SessionLocal() as db:
+            assert (
+                complete_job_stage(db, job_id, owner="not-me", stage="audio", success=True) is False
+            )
+            assert complete_job_stage(db, job_id, owner=owner, stage="audio", success=True) is True
+            assert complete_job_stage(db, job_id, owner=owner, stage="audio", success=True) is False
+
+            j = db.get(Job, job_id)
+            assert j is not None
+            assert j.audio_status == StageStatus.DONE
+            assert j.audio_lease_owner is None
+    finally:
+        # Best-effort cleanup so repeated runs don't bloat the jobs table.
+        try:
+            with SessionLocal() as db:
+                j = db.get(Job, job_id)
+                if j is not None:
+                    db.delete(j)
+                    db.commit()
+        except Exception:
+            pass
+
+
+def test_release_only_returns_jobs_still_held_by_owner() -> None:
+    with SessionLocal() as db:
+        job = Job(script_status=StageStatus.RUNNING)
+        job.script_lease_owner = "pytest:release"
+        job.script_lease_expires_at = Job.new_lease_expiry(datetime.now(UTC))
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        job_id = job.id
+
+    try:
+        with SessionLocal() as db:
+            assert release_job_stages(db, [job_id], owner="not-me", stage="script") == 0
+            assert release_job_stages(db, [job_id], owner="pytest:release", stage="script") == 1
+
+            j = db.get(Job, job_id)
+            assert j is not None
+            assert j.script_status == StageStatus.READY
+            assert j.script_lease_owner is None
+            assert j.script_lease_expires_at is None
+    finally:
+        try:
+            with SessionLocal() as db:
+                j = db.get(Job, job_id)
+                if j is not None:
+                    db.delete(j)
+                    db.commit()
+        except Exception:
+            pass
+
+
+def test_bulk_complete_only_touches_jobs_held_by_owner() -> None:
+    owner = "pytest:bulk"
+    with SessionLocal() as db:
+        jobs = [Job(visuals_status=StageStatus.RUNNING) for _ in range(3)]
+        for job, job_owner in zip(jobs, (owner, owner, "someone-else"), strict=True):
+            job.visuals_lease_owner = job_owner
+        db.add_all(jobs)
+        db.commit()
+        job_ids = [job.id for job in jobs]
+
+    try:
+        with SessionLocal() as db:
+            completed = complete_job_stages_done(db, job_ids, owner=owner, stage="visuals")
+            assert completed == set(job_ids[:2])
+
+            statuses = [db.get(Job, job_id).visuals_status for job_id in job_ids]
+            assert statuses == [StageStatus.DONE, StageStatus.DONE, StageStatus.RUNNING]
+    finally:
+        try:
+            with SessionLocal() as db:
+                for job_id in job_ids:
+                    j = db.get(Job, job_id)
+                    if j is not None:
+                        db.delete(j)
+                db.commit()
+        except Exception:
+            pass
@@ -0,0 +1,90 @@
+import threading
+import time
+
+import pytest
+from sqlalchemy import text
+
+from sleepy_factory.cli import orchestrator_tick
+from sleepy_factory.db.models import Job
+from sleepy_factory.db.notify import ORCHESTRATOR, Listener, notify
+from sleepy_factory.db.session import SessionLocal
+
+pytestmark = pytest.mark.smoke
+
+
+def test_listener_wakes_on_commit_and_filters_payloads() -> None:
+    # If you explicitly run smoke tests, DB should be up. Fail loudly if not.
+    with SessionLocal() as db:
+        db.execute(text("SELECT 1"))
+
+    with Listener({ORCHESTRATOR}, threading.Event()) as listener:
+        # Open the LISTEN connection before anything is sent.
+        assert listener.wait(0.01) is False
+
+        # Other payloads don't wake us.
+        with SessionLocal() as db:
+            notify(db, "render")
+            db.commit()
+        assert listener.wait(0.2) is False
+
+        # Nothing is delivered until the sending transaction commits.
+        with SessionLocal() as db:
+            notify(db, ORCHESTRATOR)
+            assert listener.wait(0.2) is False
+            db.commit()
+
+        start = time.monotonic()
+        assert listener.wait(5.0) is True
+        assert time.monotonic() - start < 1.0
+
+
+def test_listener_sees_every_payload_sent_in_one_commit() -> None:
+    with Listener({"render"}, threading.Event()) as listener:
+        assert listener.wait(0.01) is False
+
+        # Same transaction, so all four usually arrive in one packet; ours is last.
+        with SessionLocal() as db:
+            notify(db, "script", "audio", "visuals", "render")
+            db.commit()
+        assert listener.wait(5.0) is True
+
+
+def test_listener_drains_notifications_answered_by_a_wakeup() -> None:
+    with Listener({"audio"}, threading.Event()) as listener:
+        assert listener.wait(0.01) is False
+
+        for _ in range(2):
+            with SessionLocal() as db:
+                notify(db, "audio")
+                db.commit()
+        time.sleep(0.2)  # let both arrive before we look
+
+        # One wakeup covers both; the second must not wake the next wait().
+        assert listener.wait(5.0) is True
+        assert listener.wait(0.2) is False
+
+
+def test_orchestrator_tick_wakes_only_stages_that_moved() -> None:
+    stop = threading.Event()
+    with Listener({"script"}, stop) as script, Listener({"audio"}, stop) as audio:
+        assert script.wait(0.01) is False
+        assert audio.wait(0.01) is False
+
+        with SessionLocal() as db:
+            job = Job()
+            db.add(job)
+            db.commit()
+            job_id = job.id
+
+        try:
+            # A fresh job only opens its script stage.
+            with SessionLocal() as db:
+                assert orchestrator_tick(db) >= 1
+            assert script.wait(5.0) is True
+            assert audio.wait(0.2) is False
+        finally:
+            with SessionLocal() as db:
+                j = db.get(Job, job_id)
+                if j is not None:
+                    db.delete(j)
+                    db.commit()
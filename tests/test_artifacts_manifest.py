@@ -1,4 +1,8 @@
+import errno
+import hashlib
 import json
+import os
+import shutil
 from pathlib import Path
 
 import pytest
@@ -38,12 +42,12 @@ def test_artifacts_write_creates_files_and_manifest(
     assert "script/script.md" in relpaths
     assert "script/script.json" in relpaths
 
-    # Validate files actually exist on disk where relpath claims.
-    for a in manifest["artifacts"]:
-        rel = Path(a["relpath"])
-        full = artifacts.job_dir(job_id) / rel
-        assert full.exists()
+    # Validate files actually exist on disk where relpath claims (one walk, one assert).
+    root = artifacts.job_dir(job_id)
+    on_disk = {_norm(str(p.relative_to(root))) for p in root.rglob("*") if p.is_file()}
+    assert relpaths <= on_disk
 
+    for a in manifest["artifacts"]:
         # Sanity checks on record fields.
         assert a["bytes"] >= 1
         assert isinstance(a["sha256"], str)
@@ -61,3 +65,187 @@ def test_artifacts_write_creates_files_and_manifest(
     # Ensure the file content is the new content.
     script_path = artifacts.job_dir(job_id) / Path("script/script.md")
     assert script_path.read_text(encoding="utf-8") == "# Hello again\n"
+
+
+def test_manifest_cache_picks_up_external_edits(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(artifacts, "ARTIFACTS_ROOT", tmp_path / "artifacts", raising=True)
+
+    job_id = "unit-job-cache"
+    artifacts.write_text(job_id, "script", "script.md", "# Hello\n", kind="script_markdown")
+
+    # Simulate another process rewriting the manifest behind our back.
+    manifest_path = artifacts.job_dir(job_id) / "manifest.json"
+    external = {"job_id": job_id, "artifacts": [{"relpath": "other/file.txt", "kind": "x"}]}
+    manifest_path.write_text(json.dumps(external), encoding="utf-8")
+    os.utime(manifest_path, ns=(0, 0))
+
+    assert artifacts.load_manifest(job_id) == external
+
+    artifacts.write_text(job_id, "script", "script.md", "# Hello again\n", kind="script_markdown")
+    relpaths = [a["relpath"] for a in artifacts.load_manifest(job_id)["artifacts"]]
+    assert relpaths == ["other/file.txt", "script/script.md"]
+
+
+def test_load_manifest_returns_an_independent_copy(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(artifacts, "ARTIFACTS_ROOT", tmp_path / "artifacts", raising=True)
+
+    job_id = "unit-job-copy"
+    artifacts.write_text(job_id, "script", "script.md", "# Hello\n", kind="script_markdown")
+
+    mine = artifacts.load_manifest(job_id)
+    mine["artifacts"][0]["kind"] = "tampered"
+    mine["artifacts"].clear()
+
+    (record,) = artifacts.load_manifest(job_id)["artifacts"]
+    assert record["kind"] == "script_markdown"
+
+
+def test_manifest_batch_writes_once_on_exit(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(artifacts, "ARTIFACTS_ROOT", tmp_path / "artifacts", raising=True)
+
+    job_id = "unit-job-batch"
+    manifest_path = artifacts.job_dir(job_id) / "manifest.json"
+
+    with artifacts.manifest_batch(job_id):
+        artifacts.write_text(job_id, "script", "script.md", "# Hello\n", kind="script_markdown")
+        artifacts.write_json(
+            job_id, "script", "script.json", {"ok": True}, kind="script_structured"
+        )
+        # Deferred: nothing on disk yet, but readers in this process see the pending records.
+        assert not manifest_path.exists()
+        assert len(artifacts.load_manifest(job_id)["artifacts"]) == 2
+
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    assert {_norm(a["relpath"]) for a in manifest["artifacts"]} == {
+        "script/script.md",
+        "script/script.json",
+    }
+
+
+def test_manifest_cache_entry_is_dropped_after_batch_flush(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(artifacts, "ARTIFACTS_ROOT", tmp_path / "artifacts", raising=True)
+
+    job_id = "unit-job-evict"
+    manifest_path = artifacts.job_dir(job_id) / "manifest.json"
+    with artifacts.manifest_batch(job_id):
+        artifacts.write_text(job_id, "script", "script.md", "# Hello\n", kind="script_markdown")
+        assert manifest_path in artifacts._MANIFEST_CACHE
+
+    assert manifest_path not in artifacts._MANIFEST_CACHE
+    # Still readable from disk afterwards.
+    assert len(artifacts.load_manifest(job_id)["artifacts"]) == 1
+
+
+def test_write_path_moves_file_and_records_digest(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(artifacts, "ARTIFACTS_ROOT", tmp_path / "artifacts", raising=True)
+
+    job_id = "unit-job-path"
+    payload = b"\x00\x01" * 4096
+    src = artifacts.stage_dir(job_id, "render") / "tmp-output.mp4"
+    src.write_bytes(payload)
+
+    p = artifacts.write_path(job_id, "render", "final.mp4", src, kind="final_video")
+
+    assert not src.exists()
+    assert p.read_bytes() == payload
+
+    (record,) = artifacts.load_manifest(job_id)["artifacts"]
+    assert _norm(record["relpath"]) == "render/final.mp4"
+    assert record["bytes"] == len(payload)
+    assert record["sha256"] == hashlib.sha256(payload).hexdigest()
+
+
+def test_write_path_copies_across_filesystems(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(artifacts, "ARTIFACTS_ROOT", tmp_path / "artifacts", raising=True)
+
+    src = tmp_path / "elsewhere.mp4"
+    src.write_bytes(b"video")
+    real_replace = os.replace
+
+    def replace(a: os.PathLike[str], b: os.PathLike[str]) -> None:
+        # Only the direct move from the "other filesystem" fails, as rename(2) would.
+        if Path(a) == src:
+            raise OSError(errno.EXDEV, os.strerror(errno.EXDEV))
+        real_replace(a, b)
+
+    monkeypatch.setattr(artifacts.os, "replace", replace)
+    p = artifacts.write_path("unit-job-exdev", "render", "final.mp4", src, kind="final_video")
+
+    assert not src.exists()
+    assert p.read_bytes() == b"video"
+    assert [q.name for q in p.parent.iterdir()] == ["final.mp4"]
+
+
+def test_writes_recreate_dirs_removed_behind_the_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(artifacts, "ARTIFACTS_ROOT", tmp_path / "artifacts", raising=True)
+
+    job_id = "unit-job-rmtree"
+    artifacts.write_text(job_id, "script", "script.md", "# v1\n", kind="script_markdown")
+
+    # Another process (e.g. `sf clean-artifacts`) wipes the tree; this one still thinks the
+    # directories exist.
+    shutil.rmtree(tmp_path / "artifacts")
+
+    p = artifacts.write_text(job_id, "script", "script.md", "# v2\n", kind="script_markdown")
+    assert p.read_bytes() == b"# v2\n"
+
+    shutil.rmtree(tmp_path / "artifacts" / job_id / "script")
+    src = tmp_path / "render.tmp"
+    src.write_bytes(b"video")
+    moved = artifacts.write_path(job_id, "script", "final.mp4", src, kind="final_video")
+    assert moved.read_bytes() == b"video"
+
+    manifest = json.loads((tmp_path / "artifacts" / job_id / "manifest.json").read_bytes())
+    assert {_norm(a["relpath"]) for a in manifest["artifacts"]} == {
+        "script/script.md",
+        "script/final.mp4",
+    }
+
+
+def test_unflushed_batch_is_recovered_from_manifest_log(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(artifacts, "ARTIFACTS_ROOT", tmp_path / "artifacts", raising=True)
+
+    job_id = "unit-job-log"
+    artifacts.write_text(job_id, "script", "script.md", "# v1\n", kind="script_markdown")
+
+    # Simulate a worker that died mid-batch: records reached manifest.jsonl, manifest.json
+    # was never rewritten.
+    monkeypatch.setattr(artifacts, "_flush_and_evict", lambda job_id: None)
+    with artifacts.manifest_batch(job_id):
+        artifacts.write_text(job_id, "script", "script.md", "# v2\n", kind="script_markdown")
+        artifacts.write_text(job_id, "audio", "voice.txt", "hi\n", kind="audio_text")
+    monkeypatch.undo()
+    monkeypatch.setattr(artifacts, "ARTIFACTS_ROOT", tmp_path / "artifacts", raising=True)
+    artifacts.reset_caches()
+
+    log_path = artifacts.job_dir(job_id) / "manifest.jsonl"
+    assert len(log_path.read_bytes().splitlines()) == 2
+
+    manifest = artifacts.load_manifest(job_id)
+    by_relpath = {_norm(a["relpath"]): a for a in manifest["artifacts"]}
+    assert set(by_relpath) == {"script/script.md", "audio/voice.txt"}
+    assert by_relpath["script/script.md"]["bytes"] == len(b"# v2\n")
+    # Reading alone leaves the files alone; the next flush folds the log into manifest.json.
+    assert log_path.exists()
+
+    artifacts.flush_manifest(job_id)
+    assert not log_path.exists()
+
+    on_disk = json.loads((artifacts.job_dir(job_id) / "manifest.json").read_text(encoding="utf-8"))
+    assert on_disk["artifacts"] == manifest["artifacts"]